@@ -9,14 +9,17 @@ Author: Renan Birck
 Version: 2.0.0 (Refactored)
 """
 
+from pathlib import Path
+
+import pandas as pd
 import streamlit as st
-from dotenv import load_dotenv
-from streamlit_option_menu import option_menu
+
+# Importing update_load_data also loads .env, once per process
 from update_load_data import (
-    get_country_list,
-    get_country_data,
-    get_year_range,
+    get_app_state,
+    get_startup_metadata,
     load_complexity_data,
+    slice_years,
 )
 from src.components import (
     render_dashboard_sidebar,
@@ -33,9 +36,6 @@ from src.pages import (
     render_contact_page,
 )
 
-# Load environment variables
-load_dotenv()
-
 # ==============================================================================
 # PAGE CONFIGURATION
 # ==============================================================================
@@ -49,40 +49,72 @@ st.set_page_config(
 # ==============================================================================
 # CUSTOM CSS
 # ==============================================================================
-st.markdown(
-    """
-    <style>
-    .main {
-        padding: 0rem 1rem;
-    }
-    .stPlotlyChart {
-        background-color: white;
-        border-radius: 5px;
-        padding: 10px;
-        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-    }
-    h1 {
-        color: #2C3E50;
-        padding-bottom: 1rem;
-        border-bottom: 3px solid #4C82F7;
-    }
-    h2 {
-        color: #34495E;
-        margin-top: 2rem;
-    }
-    h3 {
-        color: #7F8C8D;
-    }
-    .metric-container {
-        background-color: #f8f9fa;
-        padding: 1rem;
-        border-radius: 5px;
-        border-left: 4px solid #4C82F7;
-    }
-    </style>
-    """,
-    unsafe_allow_html=True,
-)
+CSS_PATH = Path(__file__).parent / "assets" / "app.css"
+
+
+@st.cache_data(show_spinner=False)
+def _load_css(path: str) -> str:
+    """Read a stylesheet from disk once; reruns reuse the cached string."""
+    return Path(path).read_text(encoding="utf-8")
+
+
+# Streamlit drops elements that a rerun does not emit again, so the style tag
+# is re-sent every run; only the file read is cached.
+st.markdown(f"<style>{_load_css(str(CSS_PATH))}</style>", unsafe_allow_html=True)
+
+
+# ==============================================================================
+# NAVIGATION
+# ==============================================================================
+PAGES = {
+    "Home": ":material/home:",
+    "Dashboard": ":material/bar_chart:",
+    "Methodology": ":material/description:",
+    "Authors": ":material/badge:",
+    "Contact Us": ":material/mail:",
+    "Data Download": ":material/download:",
+}
+
+VISUALIZATIONS = {
+    "Index Evolution": ":material/show_chart:",
+    "Country Comparison": ":material/public:",
+    "Radar Chart": ":material/pentagon:",
+}
+
+# Session keys of the dashboard sidebar filters
+FILTER_KEYS = ("main_country", "comparison_countries", "year_range")
+
+
+def _render_menu(label: str, options: dict, key: str) -> str:
+    """Render a native segmented menu and return the selected option."""
+    st.session_state.setdefault(key, next(iter(options)))
+    st.session_state[f"_{key}_previous"] = st.session_state[key]
+
+    return st.segmented_control(
+        label,
+        options=list(options),
+        format_func=lambda option: f"{options[option]} {option}",
+        key=key,
+        on_change=_keep_selection,
+        args=(key,),
+        label_visibility="collapsed",
+    )
+
+
+def _keep_selection(key: str):
+    """Clicking the active option deselects it; keep the previous one instead."""
+    if st.session_state[key] is None:
+        st.session_state[key] = st.session_state[f"_{key}_previous"]
+
+
+def _keep_filters():
+    """Keep the dashboard filters while another page is shown."""
+    # Streamlit drops the state of widgets a run does not render; re-assigning
+    # the keys turns them into plain session values that survive until the
+    # sidebar is drawn again
+    for key in FILTER_KEYS:
+        if key in st.session_state:
+            st.session_state[key] = st.session_state[key]
 
 
 # ==============================================================================
@@ -99,73 +131,10 @@ def main():
     # ==========================================================================
     # TOP NAVIGATION MENU
     # ==========================================================================
-    selected_page = option_menu(
-        menu_title=None,
-        options=[
-            "Home",
-            "Dashboard",
-            "Methodology",
-            "Authors",
-            "Contact Us",
-            "Data Download",
-        ],
-        icons=[
-            "house-door",
-            "bar-chart-line",
-            "file-text",
-            "person-badge",
-            "envelope",
-            "download",
-        ],
-        menu_icon="cast",
-        default_index=0,
-        orientation="horizontal",
-        styles={
-            "container": {
-                "padding": "8px",
-                "background-color": "transparent",
-                "margin": "0",
-                "display": "flex",
-                "justify-content": "center",
-                "gap": "10px",
-            },
-            "icon": {
-                "color": "inherit",
-                "font-size": "15px",
-            },
-            "nav-link": {
-                "font-size": "14px",
-                "font-weight": "500",
-                "text-align": "center",
-                "padding": "12px 28px",
-                "border-radius": "25px",
-                "color": "#1a1a1a",
-                "background-color": "#f0f2f6",
-                "--hover-color": "#e0e4eb",
-                "transition": "all 0.2s ease",
-                "border": "1px solid #e0e4eb",
-            },
-            "nav-link-selected": {
-                "background": "linear-gradient(135deg, #4C82F7 0%, #3a6fd8 100%)",
-                "color": "white",
-                "font-weight": "600",
-                "border": "none",
-                "box-shadow": "0 4px 15px rgba(76, 130, 247, 0.35)",
-            },
-        },
-    )
-
-    # ==========================================================================
-    # SIDEBAR - Always visible with filters
-    # ==========================================================================
-    with st.spinner("Loading countries..."):
-        countries = get_country_list()
-        year_min, year_max = get_year_range()
+    selected_page = _render_menu("Navigation", PAGES, key="page")
 
-    with st.sidebar:
-        selected_country, comparison_countries, year_range = render_dashboard_sidebar(
-            countries, year_min, year_max
-        )
+    if selected_page != "Dashboard":
+        _keep_filters()
 
     # ==========================================================================
     # PAGE ROUTING
@@ -174,7 +143,25 @@ def main():
         render_home_page()
 
     elif selected_page == "Dashboard":
-        _render_dashboard_page(selected_country, comparison_countries, year_range)
+        # ======================================================================
+        # SIDEBAR - Filters, only built on the page that reads them
+        # ======================================================================
+        try:
+            state = get_app_state()
+        except Exception as e:
+            # Nothing is cached on failure: the next rerun tries again
+            st.error(f"❌ Error loading data: {str(e)}")
+        else:
+            year_min, year_max = state.years
+
+            with st.sidebar:
+                selected_country, comparison_countries, year_range = (
+                    render_dashboard_sidebar(state.countries, year_min, year_max)
+                )
+
+            _render_dashboard_page(
+                state, selected_country, comparison_countries, year_range
+            )
 
     elif selected_page == "Methodology":
         render_methodology_page()
@@ -186,7 +173,7 @@ def main():
         render_contact_page()
 
     elif selected_page == "Data Download":
-        render_download_page(get_country_list, get_year_range, load_complexity_data)
+        render_download_page(get_startup_metadata, load_complexity_data)
 
     # ==========================================================================
     # FOOTER
@@ -197,7 +184,7 @@ def main():
     )
 
 
-def _render_dashboard_page(selected_country, comparison_countries, year_range):
+def _render_dashboard_page(state, selected_country, comparison_countries, year_range):
     """Render the main dashboard page with visualizations."""
     # Check if a country is selected
     if not selected_country:
@@ -206,88 +193,68 @@ def _render_dashboard_page(selected_country, comparison_countries, year_range):
         )
         return
 
-    # Load data
-    with st.spinner(f"Loading data for {selected_country}..."):
-        df_main = get_country_data(selected_country)
-        df_main_filtered = df_main[
-            (df_main["year"] >= year_range[0]) & (df_main["year"] <= year_range[1])
-        ]
-
-        if comparison_countries:
-            all_countries = [selected_country] + comparison_countries
-            df_comparison = load_complexity_data(
-                countries=all_countries,
-                years=tuple(range(year_range[0], year_range[1] + 1)),
-            )
-        else:
-            df_comparison = df_main_filtered
+    # Load data: per-country frames are pre-split in the app state, so this is
+    # a dict lookup plus a binary search on year (no query, no spinner)
+    df_main = state.by_country[selected_country]
+    df_main_filtered = slice_years(df_main, year_range)
 
-    # Check if data is available
+    # Check if data is available before slicing the comparison countries
     if df_main_filtered.empty:
         st.warning(
             f"No data available for {selected_country} in the selected year range."
         )
         return
 
+    if comparison_countries:
+        df_comparison = pd.concat(
+            [df_main_filtered]
+            + [
+                slice_years(state.by_country[c], year_range)
+                for c in comparison_countries
+            ],
+            ignore_index=True,
+        )
+    else:
+        df_comparison = df_main_filtered
+
     # Display overview section
     st.header(f"📈 Overview: {selected_country}")
     render_metrics(df_main_filtered, selected_country)
 
     st.markdown("---")
 
+    _render_visualizations(
+        df_main_filtered, df_comparison, selected_country, comparison_countries
+    )
+
+
+@st.fragment
+def _render_visualizations(
+    df_main_filtered, df_comparison, selected_country, comparison_countries
+):
+    """
+    Render the visualization tabs and the selected chart.
+
+    Runs as a fragment: switching tabs or changing a chart option reruns only
+    this block, not the data loading and metrics above it.
+    """
     # ==========================================================================
     # VISUALIZATION TABS
     # ==========================================================================
-    selected_tab = option_menu(
-        menu_title=None,
-        options=["Index Evolution", "Country Comparison", "Radar Chart"],
-        icons=["graph-up", "globe", "pentagon"],
-        menu_icon="cast",
-        default_index=0,
-        orientation="horizontal",
-        key="visualization_tabs",
-        styles={
-            "container": {
-                "padding": "8px",
-                "background-color": "transparent",
-                "margin": "0",
-                "display": "flex",
-                "justify-content": "center",
-                "gap": "10px",
-            },
-            "icon": {
-                "color": "inherit",
-                "font-size": "16px",
-            },
-            "nav-link": {
-                "font-size": "14px",
-                "font-weight": "500",
-                "text-align": "center",
-                "padding": "10px 24px",
-                "border-radius": "20px",
-                "color": "#1a1a1a",
-                "background-color": "#f0f2f6",
-                "--hover-color": "#e0e4eb",
-                "transition": "all 0.2s ease",
-                "border": "1px solid #e0e4eb",
-            },
-            "nav-link-selected": {
-                "background": "linear-gradient(135deg, #4C82F7 0%, #3a6fd8 100%)",
-                "color": "white",
-                "font-weight": "600",
-                "border": "none",
-                "box-shadow": "0 3px 10px rgba(76, 130, 247, 0.3)",
-            },
-        },
+    selected_tab = _render_menu(
+        "Visualization", VISUALIZATIONS, key="visualization_tabs"
     )
 
+    # Main country first, shared by the comparison and radar charts
+    countries_to_compare = (selected_country, *comparison_countries)
+
     # Render selected visualization
     if selected_tab == "Index Evolution":
         render_evolution_chart(df_main_filtered, selected_country)
     elif selected_tab == "Country Comparison":
-        render_comparison_chart(df_comparison, selected_country, comparison_countries)
+        render_comparison_chart(df_comparison, countries_to_compare)
     elif selected_tab == "Radar Chart":
-        render_radar_chart(df_comparison, selected_country, comparison_countries)
+        render_radar_chart(df_comparison, countries_to_compare)
 
 
 # ==============================================================================
@@ -1,18 +1,79 @@
 # %%
+import io
+import os
+from functools import cache
+
 import pandas as pd
+from dotenv import load_dotenv
 from sqlalchemy import create_engine
 
-# Configuração do banco de dados
-usuario = "rnbirck"
-senha = "ceiunisinos"
-host = "localhost"
-banco = "cei"
-engine = create_engine(f"postgresql+psycopg2://{usuario}:{senha}@{host}/{banco}")
+# Carrega variáveis de ambiente (mesmas credenciais usadas no upload ao Supabase)
+load_dotenv()
+
+# Planilha original (exportação legível) e cópia colunar usada na carga.
+# Ler Parquet evita o parsing do XLSX; a cópia é regenerada quando a planilha muda.
+ARQUIVO_EXCEL = "data/indice_complexidade_institucional_by_year.xlsx"
+ARQUIVO_PARQUET = "data/indice_complexidade_institucional_by_year.parquet"
+
+TABELA = "indice_complexidade_institucional"
+
+
+@cache
+def get_engine():
+    """
+    Cria a engine do banco local na primeira chamada, com credenciais do .env.
+    """
+    usuario = os.getenv("DB_USUARIO")
+    senha = os.getenv("DB_SENHA")
+    host = os.getenv("DB_HOST")
+    banco = os.getenv("DB_BANCO")
+
+    if not all([usuario, senha, host, banco]):
+        raise RuntimeError(
+            "Variáveis de conexão com banco local não encontradas no .env"
+        )
+
+    return create_engine(f"postgresql+psycopg2://{usuario}:{senha}@{host}/{banco}")
+
 
-indices_raw = pd.read_excel("data/indice_complexidade_institucional_by_year.xlsx")
+def carregar_indices() -> pd.DataFrame:
+    """
+    Lê os índices da cópia Parquet, regenerando-a se a planilha for mais nova.
+    """
+    if not os.path.exists(ARQUIVO_PARQUET) or os.path.getmtime(
+        ARQUIVO_EXCEL
+    ) > os.path.getmtime(ARQUIVO_PARQUET):
+        pd.read_excel(ARQUIVO_EXCEL).to_parquet(
+            ARQUIVO_PARQUET, compression="snappy", index=False
+        )
 
-indices = indices_raw.drop(columns=["ici_all5"]).rename(columns={"ici": "indice_total"})
+    indices_raw = pd.read_parquet(ARQUIVO_PARQUET)
 
-indices.to_sql(
-    "indice_complexidade_institucional", con=engine, if_exists="replace", index=False
-)
+    return indices_raw.drop(columns=["ici_all5"], errors="ignore").rename(
+        columns={"ici": "indice_total"}
+    )
+
+
+def gravar_indices(indices: pd.DataFrame):
+    """
+    Substitui a tabela do banco local pelos índices informados.
+    """
+    buffer = io.StringIO()
+    indices.to_csv(buffer, index=False, header=False)
+    buffer.seek(0)
+
+    colunas = ", ".join(f'"{col}"' for col in indices.columns)
+
+    # Cria a tabela vazia com os tipos inferidos pelo pandas e carrega as linhas
+    # com um único COPY, em vez dos INSERTs linha a linha do to_sql. DDL e COPY
+    # rodam na mesma transação: se o COPY falhar, a tabela antiga é mantida
+    with get_engine().begin() as conexao:
+        indices.head(0).to_sql(TABELA, con=conexao, if_exists="replace", index=False)
+
+        with conexao.connection.cursor() as cursor:
+            cursor.copy_expert(f"COPY {TABELA} ({colunas}) FROM STDIN WITH CSV", buffer)
+
+
+# %%
+if __name__ == "__main__":
+    gravar_indices(carregar_indices())
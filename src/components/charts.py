@@ -2,98 +2,217 @@
 Chart components for the Institutional Complexity Index Dashboard.
 """
 
+from functools import lru_cache
+
 import streamlit as st
+import numpy as np
 import pandas as pd
-import plotly.graph_objects as go
 from src.config import INDEX_COLORS, INDEX_LABELS
 
+# plotly.graph_objects is imported inside the functions that build figures: it
+# pulls in a large module tree that pages without charts should not pay for.
 
-def get_country_colors(countries: list) -> dict:
-    """Generate consistent color mapping for countries."""
-    color_palette = [
-        "#1f77b4",  # Blue
-        "#ff7f0e",  # Orange
-        "#2ca02c",  # Green
-        "#d62728",  # Red
-        "#9467bd",  # Purple
-        "#8c564b",  # Brown
-        "#e377c2",  # Pink
-        "#7f7f7f",  # Gray
-        "#bcbd22",  # Yellow-green
-        "#17becf",  # Cyan
-    ]
-    return {
-        country: color_palette[i % len(color_palette)]
-        for i, country in enumerate(countries)
-    }
+# Upper bound on points sent per line trace (a chart is ~1000 px wide)
+MAX_POINTS_PER_TRACE = 1000
 
+# Above this many points in a trace, value labels are dropped (hover still
+# shows them): each label is a separate text node in the browser
+MAX_LABELED_POINTS = 15
+
+# Above this many points in one chart, draw lines with WebGL instead of SVG
+WEBGL_POINT_THRESHOLD = 5000
 
-def render_evolution_chart(df_main_filtered: pd.DataFrame, selected_country: str):
-    """Render the index evolution chart."""
-    st.subheader(f"Index Evolution - {selected_country}")
 
-    fig_evolution = go.Figure()
+def _thin_series(x: np.ndarray, y: np.ndarray) -> tuple:
+    """Evenly decimate a series to MAX_POINTS_PER_TRACE, keeping both ends."""
+    if len(x) <= MAX_POINTS_PER_TRACE:
+        return x, y
+    keep = np.linspace(0, len(x) - 1, MAX_POINTS_PER_TRACE).astype(int)
+    return x[keep], y[keep]
 
-    indices_cols = [
+
+def _point_labels(y: np.ndarray) -> dict:
+    """Trace mode and per-point value labels, skipped on long series."""
+    if len(y) > MAX_LABELED_POINTS:
+        return dict(mode="lines+markers")
+    return dict(
+        mode="lines+markers+text",
+        text=np.char.mod("%.2f", y),
+        textposition="top center",
+        textfont=dict(size=10, color="black"),
+    )
+
+
+# Layout shared by the evolution and comparison line charts, built once
+_AXIS_STYLE = dict(
+    tickfont=dict(color="black"),
+    title=dict(font=dict(color="black")),
+)
+_BASE_LAYOUT = dict(
+    hovermode="closest",
+    height=500,
+    template="plotly_white",
+    font=dict(color="black"),
+    xaxis=dict(**_AXIS_STYLE, dtick=1, tickmode="linear"),
+    yaxis=_AXIS_STYLE,
+    legend=dict(
+        orientation="h",
+        yanchor="bottom",
+        y=-0.3,
+        xanchor="center",
+        x=0.5,
+    ),
+)
+
+# Layout of the overlay radar (the title, which names the year, is set per call)
+_RADAR_OVERLAY_LAYOUT = dict(
+    polar=dict(
+        radialaxis=dict(
+            visible=True,
+            range=[0, 100],
+            tickfont=dict(color="black", size=11),
+            gridcolor="lightgray",
+            linecolor="lightgray",
+        ),
+        angularaxis=dict(
+            tickfont=dict(color="black", size=12),
+            gridcolor="lightgray",
+            linecolor="gray",
+        ),
+        bgcolor="white",
+    ),
+    showlegend=True,
+    legend=dict(
+        orientation="h",
+        yanchor="bottom",
+        y=-0.15,
+        xanchor="center",
+        x=0.5,
+        font=dict(size=12),
+    ),
+    height=650,
+    template="plotly_white",
+    font=dict(color="black"),
+    uirevision="radar_overlay",
+    hovermode="closest",
+    hoverdistance=30,
+)
+
+# Layout shared by every small radar in the side-by-side view
+_RADAR_SIDE_LAYOUT = dict(
+    polar=dict(
+        radialaxis=dict(
+            visible=True,
+            range=[0, 100],
+            tickfont=dict(color="black", size=9),
+            gridcolor="lightgray",
+        ),
+        angularaxis=dict(
+            tickfont=dict(color="black", size=10),
+            gridcolor="lightgray",
+        ),
+        bgcolor="white",
+    ),
+    showlegend=False,
+    height=400,
+    margin=dict(t=60, b=30, l=30, r=30),
+    template="plotly_white",
+)
+
+# Evolution chart traces: (index column, legend label, line color)
+EVOLUTION_TRACES = [
+    (col, INDEX_LABELS[col], INDEX_COLORS[col])
+    for col in (
         "indice_socio_cultural",
         "indice_mercados_negocios",
         "indice_empreendedorismo",
         "indice_eficiencia_governo",
         "indice_ambiente_juridico",
         "indice_total",
-    ]
+    )
+]
+
+# Categorical palette for countries (Plotly/D3 "category10")
+COLOR_PALETTE = [
+    "#1f77b4",  # Blue
+    "#ff7f0e",  # Orange
+    "#2ca02c",  # Green
+    "#d62728",  # Red
+    "#9467bd",  # Purple
+    "#8c564b",  # Brown
+    "#e377c2",  # Pink
+    "#7f7f7f",  # Gray
+    "#bcbd22",  # Yellow-green
+    "#17becf",  # Cyan
+]
+
+
+@lru_cache(maxsize=64)
+def _hex_to_rgba(hex_color: str, alpha: float) -> str:
+    """Translucent rgba() version of a hex color, for radar fills (memoized)."""
+    r, g, b = (int(hex_color[i : i + 2], 16) for i in (1, 3, 5))
+    return f"rgba({r}, {g}, {b}, {alpha})"
+
+
+@lru_cache(maxsize=128)
+def get_country_colors(countries: tuple) -> dict:
+    """Generate consistent color mapping for countries (memoized per tuple)."""
+    return {
+        country: COLOR_PALETTE[i % len(COLOR_PALETTE)]
+        for i, country in enumerate(countries)
+    }
+
+
+def render_evolution_chart(df_main_filtered: pd.DataFrame, selected_country: str):
+    """Render the index evolution chart."""
+    st.subheader(f"Index Evolution - {selected_country}")
 
-    for col in indices_cols:
-        fig_evolution.add_trace(
-            go.Scatter(
-                x=df_main_filtered["year"],
-                y=df_main_filtered[col],
-                mode="lines+markers+text",
-                name=INDEX_LABELS[col],
-                line=dict(color=INDEX_COLORS[col], width=3),
+    fig_evolution = _build_evolution_figure(df_main_filtered, selected_country)
+    st.plotly_chart(fig_evolution, use_container_width=True, key="evolution_chart")
+
+
+@st.cache_data(ttl="15m", max_entries=64, show_spinner=False)
+def _build_evolution_figure(df_main_filtered: pd.DataFrame, selected_country: str):
+    """Build the index evolution figure (cached per country and year slice)."""
+    import plotly.graph_objects as go
+
+    years = df_main_filtered["year"].to_numpy()
+    n_points = len(df_main_filtered) * len(EVOLUTION_TRACES)
+    scatter = go.Scattergl if n_points > WEBGL_POINT_THRESHOLD else go.Scatter
+
+    # Traces are collected first and handed to go.Figure in one batch
+    traces = []
+    for col, label, color in EVOLUTION_TRACES:
+        x, y = _thin_series(years, df_main_filtered[col].to_numpy())
+        traces.append(
+            scatter(
+                x=x,
+                y=y,
+                **_point_labels(y),
+                name=label,
+                line=dict(color=color, width=3),
                 marker=dict(size=8),
-                text=[f"{val:.2f}" for val in df_main_filtered[col]],
-                textposition="top center",
-                textfont=dict(size=10, color="black"),
                 hovertemplate="<b>%{fullData.name}</b><br>Year: %{x}<br>Value: %{y:.6f}<extra></extra>",
             )
         )
 
+    fig_evolution = go.Figure(data=traces)
     fig_evolution.update_layout(
         xaxis_title="Year",
         yaxis_title="Index Value",
-        hovermode="closest",
-        height=500,
-        template="plotly_white",
-        font=dict(color="black"),
-        xaxis=dict(
-            tickfont=dict(color="black"),
-            title=dict(font=dict(color="black")),
-            dtick=1,
-            tickmode="linear",
-        ),
-        yaxis=dict(
-            tickfont=dict(color="black"),
-            title=dict(font=dict(color="black")),
-        ),
-        legend=dict(
-            orientation="h",
-            yanchor="bottom",
-            y=-0.3,
-            xanchor="center",
-            x=0.5,
-        ),
+        uirevision=selected_country,
+        **_BASE_LAYOUT,
     )
 
-    st.plotly_chart(fig_evolution, use_container_width=True)
+    return fig_evolution
 
 
+@st.fragment
 def render_comparison_chart(
     df_comparison: pd.DataFrame,
-    selected_country: str,
-    comparison_countries: list,
+    countries_to_compare: tuple,
 ):
-    """Render the country comparison chart."""
+    """Render the country comparison chart (the index picker reruns only this)."""
     st.subheader("Compare Index Across Countries")
 
     # Select index to compare
@@ -111,85 +230,73 @@ def render_comparison_chart(
         key="index_comparison",
     )
 
-    # Determine countries to compare
-    countries_to_compare = (
-        [selected_country] + comparison_countries
-        if comparison_countries
-        else [selected_country]
-    )
-
     if len(countries_to_compare) == 1:
         st.info(
             "💡 Select comparison countries in the sidebar to compare multiple countries."
         )
 
+    fig_comparison = _build_comparison_figure(
+        df_comparison, countries_to_compare, index_to_compare
+    )
+    st.plotly_chart(fig_comparison, use_container_width=True, key="comparison_chart")
+
+
+@st.cache_data(ttl="15m", max_entries=64, show_spinner=False)
+def _build_comparison_figure(
+    df_comparison: pd.DataFrame, countries_to_compare: tuple, index_to_compare: str
+):
+    """Build the country comparison figure (cached per countries, years and index)."""
+    import plotly.graph_objects as go
+
     # Get consistent color mapping
     country_colors = get_country_colors(countries_to_compare)
 
     # Create comparison chart
-    fig_comparison = go.Figure()
+    scatter = go.Scattergl if len(df_comparison) > WEBGL_POINT_THRESHOLD else go.Scatter
 
+    # Split once per country instead of scanning the frame on every iteration
+    by_country = dict(
+        tuple(df_comparison.groupby("country_name", sort=False, observed=True))
+    )
+    traces = []
     for country in countries_to_compare:
-        df_country = df_comparison[df_comparison["country_name"] == country]
-        fig_comparison.add_trace(
-            go.Scatter(
-                x=df_country["year"],
-                y=df_country[index_to_compare],
-                mode="lines+markers+text",
+        df_country = by_country.get(country, df_comparison.iloc[:0])
+        x, y = _thin_series(
+            df_country["year"].to_numpy(), df_country[index_to_compare].to_numpy()
+        )
+        traces.append(
+            scatter(
+                x=x,
+                y=y,
+                **_point_labels(y),
                 name=country,
                 line=dict(width=3, color=country_colors[country]),
                 marker=dict(size=8, color=country_colors[country]),
-                text=[f"{val:.2f}" for val in df_country[index_to_compare]],
-                textposition="top center",
-                textfont=dict(size=10, color="black"),
                 hovertemplate="<b>%{fullData.name}</b><br>Year: %{x}<br>Value: %{y:.6f}<extra></extra>",
             )
         )
 
+    fig_comparison = go.Figure(data=traces)
     fig_comparison.update_layout(
         title=f"{INDEX_LABELS[index_to_compare]} - Country Comparison",
         xaxis_title="Year",
         yaxis_title="Index Value",
-        hovermode="closest",
-        height=500,
-        template="plotly_white",
-        font=dict(color="black"),
-        xaxis=dict(
-            tickfont=dict(color="black"),
-            title=dict(font=dict(color="black")),
-            dtick=1,
-            tickmode="linear",
-        ),
-        yaxis=dict(
-            tickfont=dict(color="black"),
-            title=dict(font=dict(color="black")),
-        ),
-        legend=dict(
-            orientation="h",
-            yanchor="bottom",
-            y=-0.3,
-            xanchor="center",
-            x=0.5,
-        ),
+        uirevision=index_to_compare,
+        **_BASE_LAYOUT,
     )
 
-    st.plotly_chart(fig_comparison, use_container_width=True)
+    return fig_comparison
 
 
+@st.fragment
 def render_radar_chart(
     df_comparison: pd.DataFrame,
-    selected_country: str,
-    comparison_countries: list,
+    countries_to_compare: tuple,
 ):
-    """Render the radar chart for multi-index comparison."""
-    st.subheader("Radar Chart - Multi-Index Comparison")
+    """Render the radar chart (year and display mode rerun only this)."""
+    import plotly.graph_objects as go
 
-    # Determine countries to compare
-    countries_to_compare = (
-        [selected_country] + comparison_countries
-        if comparison_countries
-        else [selected_country]
-    )
+    st.subheader("Radar Chart - Multi-Index Comparison")
 
     if len(countries_to_compare) == 1:
         st.info(
@@ -201,7 +308,8 @@ def render_radar_chart(
 
     with col1:
         # Select year for radar chart
-        available_years = sorted(df_comparison["year"].unique(), reverse=True)
+        # np.unique sorts in C; reversed for most recent first
+        available_years = np.unique(df_comparison["year"].to_numpy())[::-1].tolist()
         selected_radar_year = st.selectbox(
             "📅 Select Year",
             options=available_years,
@@ -241,106 +349,83 @@ def render_radar_chart(
     theta_labels_raw = [INDEX_LABELS[idx].replace(" Index", "") for idx in indices]
     theta_labels = theta_labels_raw + [theta_labels_raw[0]]
 
+    # One row per country for the selected year, split once up front
+    df_year = df_comparison[df_comparison["year"] == selected_radar_year]
+    by_country = dict(tuple(df_year.groupby("country_name", sort=False, observed=True)))
+
+    # Countries without a row for that year get no trace and no column
+    radar_countries = [c for c in countries_to_compare if c in by_country]
+
     if display_mode == "Overlay (Single Chart)":
         # Create single radar chart with improved styling
-        fig_radar = go.Figure()
-
-        for country in countries_to_compare:
-            df_country_year = df_comparison[
-                (df_comparison["country_name"] == country)
-                & (df_comparison["year"] == selected_radar_year)
-            ]
-
-            if not df_country_year.empty:
-                values = [df_country_year[idx].values[0] for idx in indices]
-                values.append(values[0])
-
-                color = country_colors[country]
-
-                # First trace: filled area (no hover)
-                fig_radar.add_trace(
-                    go.Scatterpolar(
-                        r=values,
-                        theta=theta_labels,
-                        name=country,
-                        fill="toself",
-                        fillcolor=f"rgba{tuple(list(int(color.lstrip('#')[i : i + 2], 16) for i in (0, 2, 4)) + [0.15])}",
-                        line=dict(width=3, color=color),
-                        mode="lines",
-                        showlegend=True,
-                        hoverinfo="skip",
-                    )
+        traces = []
+
+        for country in radar_countries:
+            df_country_year = by_country[country]
+
+            # Five index values plus the first again to close the polygon
+            row = df_country_year[indices].to_numpy()[0]
+            values = np.concatenate([row, row[:1]])
+
+            color = country_colors[country]
+
+            # First trace: filled area (no hover)
+            traces.append(
+                go.Scatterpolar(
+                    r=values,
+                    theta=theta_labels,
+                    name=country,
+                    fill="toself",
+                    fillcolor=_hex_to_rgba(color, 0.15),
+                    line=dict(width=3, color=color),
+                    mode="lines",
+                    showlegend=True,
+                    hoverinfo="skip",
                 )
+            )
 
-                # Second trace: markers only (with hover)
-                fig_radar.add_trace(
-                    go.Scatterpolar(
-                        r=values,
-                        theta=theta_labels,
-                        name=country,
-                        mode="markers",
-                        showlegend=False,
-                        hovertemplate=(
-                            f"<b>{country}</b><br>"
-                            "%{theta}<br>"
-                            "<b>%{r:.6f}</b>"
-                            "<extra></extra>"
-                        ),
-                        marker=dict(
-                            size=11,
-                            color=color,
-                            symbol="circle",
-                            line=dict(width=1, color="white"),
-                        ),
-                        hoverlabel=dict(
-                            bgcolor=color,
-                            font=dict(size=12, color="white", family="Arial"),
-                            bordercolor="white",
-                        ),
-                    )
+            # Second trace: markers only (with hover)
+            traces.append(
+                go.Scatterpolar(
+                    r=values,
+                    theta=theta_labels,
+                    name=country,
+                    mode="markers",
+                    showlegend=False,
+                    hovertemplate=(
+                        f"<b>{country}</b><br>"
+                        "%{theta}<br>"
+                        "<b>%{r:.6f}</b>"
+                        "<extra></extra>"
+                    ),
+                    marker=dict(
+                        size=11,
+                        color=color,
+                        symbol="circle",
+                        line=dict(width=1, color="white"),
+                    ),
+                    hoverlabel=dict(
+                        bgcolor=color,
+                        font=dict(size=12, color="white", family="Arial"),
+                        bordercolor="white",
+                    ),
                 )
+            )
 
+        fig_radar = go.Figure(data=traces)
         fig_radar.update_layout(
-            polar=dict(
-                radialaxis=dict(
-                    visible=True,
-                    range=[0, 100],
-                    tickfont=dict(color="black", size=11),
-                    gridcolor="lightgray",
-                    linecolor="lightgray",
-                ),
-                angularaxis=dict(
-                    tickfont=dict(color="black", size=12),
-                    gridcolor="lightgray",
-                    linecolor="gray",
-                ),
-                bgcolor="white",
-            ),
-            showlegend=True,
-            legend=dict(
-                orientation="h",
-                yanchor="bottom",
-                y=-0.15,
-                xanchor="center",
-                x=0.5,
-                font=dict(size=12),
-            ),
             title=dict(
                 text=f"Complexity Indices Comparison - {selected_radar_year}",
                 font=dict(size=16, color="black"),
             ),
-            height=650,
-            template="plotly_white",
-            font=dict(color="black"),
-            hovermode="closest",
-            hoverdistance=30,
+            **_RADAR_OVERLAY_LAYOUT,
         )
 
-        st.plotly_chart(fig_radar, use_container_width=True)
+        st.plotly_chart(fig_radar, use_container_width=True, key="radar_chart")
 
     else:
         # Side by side - Individual charts for each country
-        num_countries = len(countries_to_compare)
+        num_countries = len(radar_countries)
 
         if num_countries <= 2:
             cols = st.columns(num_countries)
@@ -349,68 +434,54 @@ def render_radar_chart(
         else:
             cols = st.columns(3)
 
-        for i, country in enumerate(countries_to_compare):
-            df_country_year = df_comparison[
-                (df_comparison["country_name"] == country)
-                & (df_comparison["year"] == selected_radar_year)
-            ]
-
-            if not df_country_year.empty:
-                values = [df_country_year[idx].values[0] for idx in indices]
-                values.append(values[0])
-
-                color = country_colors[country]
-
-                fig_individual = go.Figure()
-
-                fig_individual.add_trace(
-                    go.Scatterpolar(
-                        r=values,
-                        theta=theta_labels,
-                        name=country,
-                        fill="toself",
-                        fillcolor=f"rgba{tuple(list(int(color.lstrip('#')[i : i + 2], 16) for i in (0, 2, 4)) + [0.3])}",
-                        line=dict(width=3, color=color),
-                        mode="lines+markers+text",
-                        text=[f"{v:.1f}" for v in values],
-                        textposition="top center",
-                        textfont=dict(size=10, color="black"),
-                        hovertemplate=(
-                            "<b>%{theta}</b><br>"
-                            f"Country: {country}<br>"
-                            "Value: %{r:.2f}<br>"
-                            f"Year: {selected_radar_year}"
-                            "<extra></extra>"
-                        ),
-                        marker=dict(size=8, color=color),
-                    )
-                )
-
-                fig_individual.update_layout(
-                    polar=dict(
-                        radialaxis=dict(
-                            visible=True,
-                            range=[0, 100],
-                            tickfont=dict(color="black", size=9),
-                            gridcolor="lightgray",
-                        ),
-                        angularaxis=dict(
-                            tickfont=dict(color="black", size=10),
-                            gridcolor="lightgray",
-                        ),
-                        bgcolor="white",
-                    ),
-                    showlegend=False,
-                    title=dict(
-                        text=f"<b>{country}</b>",
-                        font=dict(size=14, color=color),
-                        x=0.5,
+        for i, country in enumerate(radar_countries):
+            df_country_year = by_country[country]
+
+            # Five index values plus the first again to close the polygon
+            row = df_country_year[indices].to_numpy()[0]
+            values = np.concatenate([row, row[:1]])
+
+            color = country_colors[country]
+
+            fig_individual = go.Figure()
+
+            fig_individual.add_trace(
+                go.Scatterpolar(
+                    r=values,
+                    theta=theta_labels,
+                    name=country,
+                    fill="toself",
+                    fillcolor=_hex_to_rgba(color, 0.3),
+                    line=dict(width=3, color=color),
+                    mode="lines+markers+text",
+                    text=np.char.mod("%.1f", values),
+                    textposition="top center",
+                    textfont=dict(size=10, color="black"),
+                    hovertemplate=(
+                        "<b>%{theta}</b><br>"
+                        f"Country: {country}<br>"
+                        "Value: %{r:.2f}<br>"
+                        f"Year: {selected_radar_year}"
+                        "<extra></extra>"
                     ),
-                    height=400,
-                    margin=dict(t=60, b=30, l=30, r=30),
-                    template="plotly_white",
+                    marker=dict(size=8, color=color),
                 )
+            )
 
-                col_idx = i % len(cols)
-                with cols[col_idx]:
-                    st.plotly_chart(fig_individual, use_container_width=True)
+            fig_individual.update_layout(
+                title=dict(
+                    text=f"<b>{country}</b>",
+                    font=dict(size=14, color=color),
+                    x=0.5,
+                ),
+                uirevision=country,
+                **_RADAR_SIDE_LAYOUT,
+            )
+
+            col_idx = i % len(cols)
+            with cols[col_idx]:
+                st.plotly_chart(
+                    fig_individual,
+                    use_container_width=True,
+                    key=f"radar_chart_{country}",
+                )
@@ -4,155 +4,80 @@ Metrics component for the Institutional Complexity Index Dashboard.
 
 import streamlit as st
 import pandas as pd
-from update_load_data import load_complexity_data
+from update_load_data import get_app_state
+
+# Ranking cards in display order: (index column, card label)
+METRIC_SPECS = (
+    ("indice_socio_cultural", "👥 Socio-Cultural"),
+    ("indice_mercados_negocios", "💼 Markets & Business"),
+    ("indice_empreendedorismo", "🚀 Entrepreneurship"),
+    ("indice_eficiencia_governo", "🏛️ Government Efficiency"),
+    ("indice_ambiente_juridico", "⚖️ Legal Environment"),
+    ("indice_total", "📊 Total Index"),
+)
+INDICES = [idx for idx, _ in METRIC_SPECS]
+
+
+@st.cache_data(ttl="1h", max_entries=32, show_spinner=False)
+def _rankings_for_year(year: int) -> pd.DataFrame:
+    """
+    Rank all countries on every index for one year (1 = highest value).
+
+    Null index values are expected (countries missing a dimension) and get a
+    null rank, hence the nullable Int16 dtype.
+    """
+    # Slice the in-memory full table instead of querying the year again; it
+    # is loaded page by page, so every country of the year is present
+    df = get_app_state().df
+    df_year = df[df["year"] == year]
+    return (
+        df_year.set_index("country_name")[INDICES]
+        .rank(ascending=False, method="min")
+        .astype("Int16")
+    )
 
 
 def render_metrics(df_main_filtered: pd.DataFrame, selected_country: str):
     """Render key metrics cards showing country rankings."""
-    latest_year_data = df_main_filtered.iloc[-1]
-    latest_year = int(latest_year_data["year"])
+    # Nothing to rank before a country is chosen or when the slice is empty
+    if not selected_country or df_main_filtered.empty:
+        return
 
-    # Load all countries data for the latest year to calculate rankings
-    df_all_latest = load_complexity_data(years=[latest_year])
+    years = df_main_filtered["year"]
+    latest_year = int(years.iat[-1])
 
-    # Calculate rankings for each index (lower rank = better performance)
-    indices = [
-        "indice_socio_cultural",
-        "indice_mercados_negocios",
-        "indice_empreendedorismo",
-        "indice_eficiencia_governo",
-        "indice_ambiente_juridico",
-        "indice_total",
-    ]
+    # Rankings for every country in the latest year (cached per year)
+    rankings_latest = _rankings_for_year(latest_year)
+    current_ranks = rankings_latest.loc[selected_country]
+    total = len(rankings_latest)
 
-    # Get rankings and previous year rankings for delta
-    rankings_current = {}
-    rankings_previous = {}
-
-    for idx in indices:
-        # Current year ranking (descending order - higher values = better rank)
-        df_all_latest[f"rank_{idx}"] = df_all_latest[idx].rank(
-            ascending=False, method="min"
-        )
-        current_rank = int(
-            df_all_latest[df_all_latest["country_name"] == selected_country][
-                f"rank_{idx}"
-            ].values[0]
-        )
-        total_countries = len(df_all_latest)
-        rankings_current[idx] = (current_rank, total_countries)
-
-    # Get previous year rankings for delta calculation
+    # Rank change on every index against the previous year, in one subtraction
+    # Delta negativo = melhoria (diminuiu número = subiu posições)
+    rank_deltas = {}
     if len(df_main_filtered) > 1:
-        previous_year = int(df_main_filtered.iloc[-2]["year"])
-        df_all_previous = load_complexity_data(years=[previous_year])
-
-        for idx in indices:
-            df_all_previous[f"rank_{idx}"] = df_all_previous[idx].rank(
-                ascending=False, method="min"
-            )
-            prev_rank = int(
-                df_all_previous[df_all_previous["country_name"] == selected_country][
-                    f"rank_{idx}"
-                ].values[0]
-            )
-            rankings_previous[idx] = prev_rank
+        previous_year = int(years.iat[-2])
+        previous_ranks = _rankings_for_year(previous_year).loc[selected_country]
+        rank_deltas = (current_ranks - previous_ranks).to_dict()
     else:
         previous_year = None
 
     # Display key metrics - All 6 indicators
-    col1, col2, col3, col4, col5, col6 = st.columns(6)
-
-    with col1:
-        rank, total = rankings_current["indice_socio_cultural"]
-        delta = None
-        delta_color = "off"
-        if previous_year and "indice_socio_cultural" in rankings_previous:
-            # Delta negativo = melhoria (diminuiu número = subiu posições)
-            delta_val = rank - rankings_previous["indice_socio_cultural"]
-            delta = f"{delta_val:+d}" if delta_val != 0 else "0"
-            delta_color = "inverse" if delta_val != 0 else "off"
-        st.metric(
-            label=f"👥 Socio-Cultural ({latest_year})",
-            value=f"{rank}º",
-            delta=delta,
-            delta_color=delta_color,
-        )
-
-    with col2:
-        rank, total = rankings_current["indice_mercados_negocios"]
-        delta = None
-        delta_color = "off"
-        if previous_year and "indice_mercados_negocios" in rankings_previous:
-            delta_val = rank - rankings_previous["indice_mercados_negocios"]
-            delta = f"{delta_val:+d}" if delta_val != 0 else "0"
-            delta_color = "inverse" if delta_val != 0 else "off"
-        st.metric(
-            label=f"💼 Markets & Business ({latest_year})",
-            value=f"{rank}º",
-            delta=delta,
-            delta_color=delta_color,
-        )
-
-    with col3:
-        rank, total = rankings_current["indice_empreendedorismo"]
+    for col, (idx, label) in zip(st.columns(len(METRIC_SPECS)), METRIC_SPECS):
+        rank = current_ranks[idx]
         delta = None
         delta_color = "off"
-        if previous_year and "indice_empreendedorismo" in rankings_previous:
-            delta_val = rank - rankings_previous["indice_empreendedorismo"]
+        # A null rank (either year) shows "–" and no delta
+        if idx in rank_deltas and not pd.isna(rank_deltas[idx]):
+            delta_val = rank_deltas[idx]
             delta = f"{delta_val:+d}" if delta_val != 0 else "0"
             delta_color = "inverse" if delta_val != 0 else "off"
-        st.metric(
-            label=f"🚀 Entrepreneurship ({latest_year})",
-            value=f"{rank}º",
-            delta=delta,
-            delta_color=delta_color,
-        )
-
-    with col4:
-        rank, total = rankings_current["indice_eficiencia_governo"]
-        delta = None
-        delta_color = "off"
-        if previous_year and "indice_eficiencia_governo" in rankings_previous:
-            delta_val = rank - rankings_previous["indice_eficiencia_governo"]
-            delta = f"{delta_val:+d}" if delta_val != 0 else "0"
-            delta_color = "inverse" if delta_val != 0 else "off"
-        st.metric(
-            label=f"🏛️ Government Efficiency ({latest_year})",
-            value=f"{rank}º",
-            delta=delta,
-            delta_color=delta_color,
-        )
-
-    with col5:
-        rank, total = rankings_current["indice_ambiente_juridico"]
-        delta = None
-        delta_color = "off"
-        if previous_year and "indice_ambiente_juridico" in rankings_previous:
-            delta_val = rank - rankings_previous["indice_ambiente_juridico"]
-            delta = f"{delta_val:+d}" if delta_val != 0 else "0"
-            delta_color = "inverse" if delta_val != 0 else "off"
-        st.metric(
-            label=f"⚖️ Legal Environment ({latest_year})",
-            value=f"{rank}º",
-            delta=delta,
-            delta_color=delta_color,
-        )
-
-    with col6:
-        rank, total = rankings_current["indice_total"]
-        delta = None
-        delta_color = "off"
-        if previous_year and "indice_total" in rankings_previous:
-            delta_val = rank - rankings_previous["indice_total"]
-            delta = f"{delta_val:+d}" if delta_val != 0 else "0"
-            delta_color = "inverse" if delta_val != 0 else "off"
-        st.metric(
-            label=f"📊 Total Index ({latest_year})",
-            value=f"{rank}º",
-            delta=delta,
-            delta_color=delta_color,
-        )
+        with col:
+            st.metric(
+                label=f"{label} ({latest_year})",
+                value="–" if pd.isna(rank) else f"{rank}º",
+                delta=delta,
+                delta_color=delta_color,
+            )
 
     # Show total countries and disclaimer about delta
     if previous_year:
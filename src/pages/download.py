@@ -9,19 +9,17 @@ from email import encoders
 from email.mime.base import MIMEBase
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
-from io import BytesIO
 
 import pandas as pd
 import streamlit as st
 
 
-def render_download_page(get_country_list_func, get_year_range_func, load_data_func):
+def render_download_page(get_metadata_func, load_data_func):
     """
     Render the data download page with email request form.
 
     Args:
-        get_country_list_func: Function to get list of countries
-        get_year_range_func: Function to get year range
+        get_metadata_func: Function returning (countries, year_min, year_max)
         load_data_func: Function to load complexity data
     """
     st.subheader("📥 Data Download Request")
@@ -33,6 +31,16 @@ def render_download_page(get_country_list_func, get_year_range_func, load_data_f
 
     st.markdown("---")
 
+    # Filter options are fixed for the session: look them up once, not per rerun
+    if "_download_options" not in st.session_state:
+        try:
+            countries, year_min, year_max = get_metadata_func()
+        except Exception as e:
+            st.error(f"❌ Error loading data: {str(e)}")
+            return
+        st.session_state["_download_options"] = (tuple(countries), year_min, year_max)
+    country_options, year_min_dl, year_max_dl = st.session_state["_download_options"]
+
     # Request form
     st.markdown("### 📋 Download Request Form")
 
@@ -65,13 +73,12 @@ def render_download_page(get_country_list_func, get_year_range_func, load_data_f
         with col3:
             download_countries = st.multiselect(
                 "Select Countries (leave empty for all)",
-                options=get_country_list_func(),
+                options=country_options,
                 default=[],
                 key="download_countries",
             )
 
         with col4:
-            year_min_dl, year_max_dl = get_year_range_func()
             download_years = st.slider(
                 "Select Year Range",
                 min_value=year_min_dl,
@@ -134,16 +141,19 @@ def _process_download_request(
         st.error("❌ Please enter a valid email address")
         return
 
-    # Load and prepare data
-    if download_countries:
-        df_download = load_data_func(
-            countries=download_countries,
-            years=tuple(range(download_years[0], download_years[1] + 1)),
-        )
-    else:
-        df_download = load_data_func(
-            years=tuple(range(download_years[0], download_years[1] + 1))
-        )
+    # Load and prepare data (countries sorted so any selection order shares
+    # the same cache entries)
+    try:
+        if download_countries:
+            df_download = load_data_func(
+                countries=tuple(sorted(download_countries)),
+                year_range=tuple(download_years),
+            )
+        else:
+            df_download = load_data_func(year_range=tuple(download_years))
+    except Exception as e:
+        st.error(f"❌ Error loading data: {str(e)}")
+        return
 
     df_download = df_download.rename(
         columns={
@@ -173,7 +183,7 @@ def _process_download_request(
     except Exception as e:
         st.error(f"❌ Error sending email: {str(e)}")
         st.info("If the problem persists, please contact the administrator.")
-        _show_fallback_download(df_download, download_years)
+        _show_fallback_download(df_download, download_countries, download_years)
 
 
 def _send_download_email(
@@ -219,13 +229,14 @@ def _send_download_email(
 
     # Prepare file attachment
     if file_format == "CSV":
-        file_data = df_download.to_csv(index=False).encode("utf-8")
+        file_data = _to_csv_bytes(
+            tuple(sorted(download_countries)), tuple(download_years), df_download
+        )
         filename = f"institutional_complexity_index_{download_years[0]}_{download_years[1]}.csv"
     else:  # Excel
-        buffer = BytesIO()
-        with pd.ExcelWriter(buffer, engine="openpyxl") as writer:
-            df_download.to_excel(writer, index=False, sheet_name="Complexity Index")
-        file_data = buffer.getvalue()
+        file_data = _to_excel_bytes(
+            tuple(sorted(download_countries)), tuple(download_years), df_download
+        )
         filename = f"institutional_complexity_index_{download_years[0]}_{download_years[1]}.xlsx"
 
     # Send email to user
@@ -303,32 +314,53 @@ This is an automated notification from the Institutional Complexity Index Dashbo
     )
 
 
-def _show_fallback_download(df_download, download_years):
+def _show_fallback_download(df_download, download_countries, download_years):
     """Show fallback download buttons when email fails."""
+    cache_key = (tuple(sorted(download_countries)), tuple(download_years))
+
     st.markdown("---")
     st.markdown("### Alternative: Direct Download")
 
     col_fallback1, col_fallback2 = st.columns(2)
 
     with col_fallback1:
-        csv = df_download.to_csv(index=False).encode("utf-8")
         st.download_button(
             label="📄 Download as CSV",
-            data=csv,
+            data=_to_csv_bytes(*cache_key, df_download),
             file_name=f"institutional_complexity_index_{download_years[0]}_{download_years[1]}.csv",
             mime="text/csv",
             use_container_width=True,
         )
 
     with col_fallback2:
-        buffer = BytesIO()
-        with pd.ExcelWriter(buffer, engine="openpyxl") as writer:
-            df_download.to_excel(writer, index=False, sheet_name="Complexity Index")
-
         st.download_button(
             label="📊 Download as Excel",
-            data=buffer.getvalue(),
+            data=_to_excel_bytes(*cache_key, df_download),
             file_name=f"institutional_complexity_index_{download_years[0]}_{download_years[1]}.xlsx",
             mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
             use_container_width=True,
         )
+
+
+# Serializations are keyed by the filters that produced the frame; the frame
+# itself is passed unhashed (leading underscore) so a hit skips hashing it too.
+@st.cache_data(ttl="1h", max_entries=16, show_spinner=False)
+def _to_csv_bytes(countries: tuple, years: tuple, _df_download: pd.DataFrame) -> bytes:
+    """Serialize the download DataFrame to CSV bytes (cached per filters)."""
+    return _df_download.to_csv(index=False).encode("utf-8")
+
+
+@st.cache_data(ttl="1h", max_entries=16, show_spinner=False)
+def _to_excel_bytes(
+    countries: tuple, years: tuple, _df_download: pd.DataFrame
+) -> bytes:
+    """Serialize the download DataFrame to an .xlsx file (cached per filters)."""
+    from io import BytesIO
+
+    buffer = BytesIO()
+    # xlsxwriter writes the sheet without building openpyxl's cell object
+    # model. Its constant_memory mode is not used: pandas writes cells column
+    # by column, and that mode drops cells from rows it has already flushed.
+    with pd.ExcelWriter(buffer, engine="xlsxwriter") as writer:
+        _df_download.to_excel(writer, index=False, sheet_name="Complexity Index")
+    return buffer.getvalue()
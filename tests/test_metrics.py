@@ -0,0 +1,52 @@
+"""
+Tests for the ranking table behind the metric cards.
+"""
+
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.components import metrics
+
+
+@pytest.fixture
+def app_state(monkeypatch):
+    """Serve a small in-memory table to _rankings_for_year."""
+    df = pd.DataFrame(
+        {
+            "country_name": ["Brazil", "Chile", "Peru"] * 2,
+            "year": [2022] * 3 + [2023] * 3,
+            **{idx: [30.0, 20.0, 10.0, 10.0, 30.0, 20.0] for idx in metrics.INDICES},
+        }
+    )
+    state = SimpleNamespace(df=df)
+    monkeypatch.setattr(metrics, "get_app_state", lambda: state)
+    metrics._rankings_for_year.clear()
+    yield df
+    metrics._rankings_for_year.clear()
+
+
+def test_rankings_for_year_orders_by_value(app_state):
+    ranks = metrics._rankings_for_year(2023)
+
+    assert ranks.loc["Chile", "indice_total"] == 1
+    assert ranks.loc["Peru", "indice_total"] == 2
+    assert ranks.loc["Brazil", "indice_total"] == 3
+
+
+def test_rankings_for_year_with_null_index(app_state):
+    app_state.loc[
+        (app_state["country_name"] == "Chile") & (app_state["year"] == 2023),
+        "indice_empreendedorismo",
+    ] = np.nan
+
+    ranks = metrics._rankings_for_year(2023)
+
+    assert ranks["indice_empreendedorismo"].dtype == "Int16"
+    assert pd.isna(ranks.loc["Chile", "indice_empreendedorismo"])
+    assert ranks.loc["Peru", "indice_empreendedorismo"] == 1
+    assert ranks.loc["Brazil", "indice_empreendedorismo"] == 2
+    # Other indices of the same year are unaffected
+    assert ranks.loc["Chile", "indice_total"] == 1
@@ -11,7 +11,8 @@ import time
 import pandas as pd
 import numpy as np
 import streamlit as st
-from typing import List, Optional
+from types import SimpleNamespace
+from typing import List, Optional, Union
 from dotenv import load_dotenv
 from supabase import create_client, Client
 
@@ -27,154 +28,340 @@ SUPABASE_KEY = os.getenv("SUPABASE_SERVICE_KEY") or os.getenv("SUPABASE_KEY")
 # Nome da tabela no Supabase
 TABLE_NAME = "dados_indice_complexidade_institucional"
 
-# Cliente Supabase (inicializado uma vez)
-supabase_client: Client = None
 
-if SUPABASE_URL and SUPABASE_KEY:
+@st.cache_resource(show_spinner=False)
+def get_supabase_client() -> Client:
+    """
+    Cria o cliente Supabase uma única vez por processo.
+
+    O cliente (e seu pool HTTP) é compartilhado entre sessões e reruns, e só é
+    criado na primeira leitura, não ao importar o módulo. Falhas geram
+    RuntimeError: o st.cache_resource não guarda exceções, então a próxima
+    chamada tenta de novo em vez de reusar um cliente ausente.
+    """
+    if not (SUPABASE_URL and SUPABASE_KEY):
+        print("⚠️ Variáveis SUPABASE_URL ou SUPABASE_KEY não encontradas.")
+        raise RuntimeError("Variáveis SUPABASE_URL ou SUPABASE_KEY não encontradas.")
+
     try:
-        supabase_client = create_client(SUPABASE_URL, SUPABASE_KEY)
-        print("✅ Conexão com Supabase estabelecida com sucesso.")
+        client = create_client(SUPABASE_URL, SUPABASE_KEY)
     except Exception as e:
         print(f"❌ Erro ao conectar ao Supabase: {e}")
-else:
-    print("⚠️ Variáveis SUPABASE_URL ou SUPABASE_KEY não encontradas.")
+        raise RuntimeError(f"Erro ao conectar ao Supabase: {e}") from e
+
+    print("✅ Conexão com Supabase estabelecida com sucesso.")
+    return client
 
 
 # ==============================================================================
 # FUNÇÕES DE LEITURA (LOAD) - Usadas pelo Dashboard
 # ==============================================================================
-CACHE_TTL = None  # Cache infinito
+CACHE_TTL = None  # Cache infinito (o app exibe seus próprios spinners)
+
+# Colunas de texto repetidas em todas as linhas: como "category" são guardadas
+# como códigos inteiros, deixando filtros e agrupamentos por país mais baratos
+CATEGORICAL_COLUMNS = ["country_name", "country_cod"]
+
+# Colunas lidas pelo dashboard e pelo download; chaves técnicas da tabela no
+# Supabase (id, timestamps) ficam de fora para não trafegar à toa
+DATA_COLUMNS = ",".join(
+    [
+        "country_name",
+        "country_cod",
+        "year",
+        "indice_socio_cultural",
+        "indice_mercados_negocios",
+        "indice_empreendedorismo",
+        "indice_eficiencia_governo",
+        "indice_ambiente_juridico",
+        "n_dims_ok",
+        "indice_total",
+    ]
+)
+
+
+def _prepare_dataframe(
+    df: pd.DataFrame, country_dtype: Union[str, pd.CategoricalDtype] = "category"
+) -> pd.DataFrame:
+    """
+    Ajusta os tipos do DataFrame montado a partir da resposta do Supabase.
+
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Linhas retornadas pelo Supabase.
+    country_dtype : str ou pd.CategoricalDtype
+        Tipo da coluna "country_name". O padrão "category" usa os países
+        presentes em df; recortes recebem o tipo da base completa.
+    """
+    dtypes = {col: "category" for col in CATEGORICAL_COLUMNS if col in df.columns}
+    if "country_name" in dtypes:
+        dtypes["country_name"] = country_dtype
+
+    df = df.astype(dtypes)
+
+    # Anos e contagens cabem em int16/int8. Os índices ficam em float64: são
+    # publicados com todas as casas decimais (download e tooltips)
+    for col in df.select_dtypes("integer").columns:
+        df[col] = pd.to_numeric(df[col], downcast="integer")
+
+    return df
+
+
+def _build_data_query(
+    supabase_client: Client, countries: Optional[tuple], year_range: Optional[tuple]
+):
+    """
+    Monta a consulta das colunas do dashboard, filtrada e ordenada.
+    """
+    query = supabase_client.table(TABLE_NAME).select(DATA_COLUMNS)
+
+    if countries:
+        query = query.in_("country_name", list(countries))
+
+    # Intervalo vira "year >= a AND year <= b" no Postgres: só as linhas
+    # pedidas trafegam, em vez de listar cada ano num IN (...)
+    if year_range:
+        query = query.gte("year", year_range[0]).lte("year", year_range[1])
 
+    # País + ano identificam cada linha: a ordem é estável entre as páginas
+    return query.order("country_name").order("year")
 
-@st.cache_data(ttl=CACHE_TTL)
+
+# O PostgREST do Supabase devolve no máximo 1000 linhas por requisição
+PAGE_SIZE = 1000
+
+
+def _fetch_all_pages(build_query) -> list:
+    """
+    Executa uma consulta página a página até receber uma página incompleta.
+
+    Parameters:
+    -----------
+    build_query : callable
+        Função que monta a consulta ordenada. É chamada a cada página, pois
+        .range() acumula parâmetros no objeto da consulta.
+
+    Returns:
+    --------
+    list
+        Todas as linhas retornadas, na ordem da consulta.
+    """
+    rows = []
+    start = 0
+    while True:
+        page = build_query().range(start, start + PAGE_SIZE - 1).execute().data
+        rows.extend(page)
+        if len(page) < PAGE_SIZE:
+            return rows
+        start += PAGE_SIZE
+
+
+# Uma entrada por combinação de filtros: o limite evita que pedidos de download
+# variados acumulem cópias da tabela na memória
+@st.cache_data(ttl=CACHE_TTL, max_entries=64, show_spinner=False)
 def load_complexity_data(
-    countries: Optional[List[str]] = None, years: Optional[tuple] = None
+    countries: Optional[tuple] = None, year_range: Optional[tuple] = None
 ) -> pd.DataFrame:
     """
     Carrega dados do índice de complexidade institucional do Supabase.
 
     Parameters:
     -----------
-    countries : List[str], optional
-        Lista de países para filtrar. Se None, carrega todos.
-    years : tuple, optional
-        Tupla de anos para filtrar. Se None, carrega todos.
+    countries : tuple, optional
+        Tupla de países para filtrar. Se None, carrega todos.
+    year_range : tuple, optional
+        Intervalo (inicial, final) de anos, inclusivo. Se None, carrega todos.
 
     Returns:
     --------
     pd.DataFrame
         DataFrame com os dados do índice de complexidade.
-    """
-    if not supabase_client:
-        st.error("Conexão com Supabase não estabelecida.")
-        return pd.DataFrame()
-
-    try:
-        query = supabase_client.table(TABLE_NAME).select("*")
-
-        if countries:
-            query = query.in_("country_name", list(countries))
 
-        if years:
-            query = query.in_("year", list(years))
+    Falhas de conexão ou de consulta geram exceção: o st.cache_data não
+    guarda exceções, então a próxima chamada tenta de novo em vez de reusar
+    um resultado vazio. Quem chama exibe o erro na interface.
+    """
+    # Países usam as categorias da base completa, para que recortes diferentes
+    # compartilhem os códigos e possam ser concatenados ou comparados sem
+    # voltar para strings
+    return _query_table(countries, year_range, _country_dtype())
 
-        response = query.order("country_name").order("year").execute()
-        return pd.DataFrame(response.data)
 
-    except Exception as e:
-        st.error(f"Erro ao carregar dados: {e}")
-        return pd.DataFrame()
+def _query_table(
+    countries: Optional[tuple] = None,
+    year_range: Optional[tuple] = None,
+    country_dtype: Union[str, pd.CategoricalDtype] = "category",
+) -> pd.DataFrame:
+    """
+    Consulta o Supabase (todas as páginas) e prepara o DataFrame resultante.
+    """
+    supabase_client = get_supabase_client()
+
+    rows = _fetch_all_pages(
+        lambda: _build_data_query(supabase_client, countries, year_range)
+    )
+    df = _prepare_dataframe(pd.DataFrame(rows), country_dtype)
+
+    # Reordena pelos códigos das categorias: a collation do Postgres pode
+    # divergir da ordem Python, e slice_years/groupby contam com blocos
+    # contíguos por país e anos crescentes (mergesort é estável e quase
+    # linear numa entrada já ordenada)
+    if not df.empty:
+        df = df.sort_values(
+            ["country_name", "year"], kind="mergesort", ignore_index=True
+        )
+    return df
 
 
-@st.cache_data(ttl=CACHE_TTL)
 def get_country_list() -> List[str]:
     """
     Retorna lista ordenada de todos os países únicos no banco.
+
+    Obtida da base completa já carregada por get_app_state, sem consulta extra.
     """
-    if not supabase_client:
-        st.error("Conexão com Supabase não estabelecida.")
-        return []
+    return get_app_state().countries
 
-    try:
-        response = supabase_client.table(TABLE_NAME).select("country_name").execute()
-        df = pd.DataFrame(response.data)
 
-        if df.empty:
-            return []
+def _country_dtype() -> pd.CategoricalDtype:
+    """
+    Tipo categórico canônico da coluna "country_name" (o da base completa).
+    """
+    return get_app_state().df["country_name"].dtype
 
-        return sorted(df["country_name"].unique().tolist())
 
-    except Exception as e:
-        st.error(f"Erro ao carregar lista de países: {e}")
-        return []
+def get_startup_metadata() -> tuple:
+    """
+    Retorna (países, ano inicial, ano final) numa única consulta ao estado.
+
+    Países e anos saem da mesma base já carregada por get_app_state, sem
+    uma consulta ao Supabase para cada um.
+    """
+    state = get_app_state()
+    year_min, year_max = state.years
+    return state.countries, year_min, year_max
 
 
-@st.cache_data(ttl=CACHE_TTL)
 def get_year_range() -> tuple:
     """
     Retorna o intervalo de anos disponíveis (min, max).
+
+    Calculado uma única vez em get_app_state, junto com a base completa.
     """
-    if not supabase_client:
-        st.error("Conexão com Supabase não estabelecida.")
-        return (2015, 2023)
+    return get_app_state().years
 
-    try:
-        response = supabase_client.table(TABLE_NAME).select("year").execute()
-        df = pd.DataFrame(response.data)
 
-        if df.empty:
-            return (2015, 2023)
+def _load_full_table() -> pd.DataFrame:
+    """
+    Carrega a base completa (chamada só por get_app_state, que a guarda).
 
-        return (int(df["year"].min()), int(df["year"].max()))
+    Não há cópia em disco: cada processo lê a base atual do Supabase, com
+    o código atual de preparo. Uma base vazia gera exceção, para que não
+    seja guardada.
 
-    except Exception as e:
-        st.error(f"Erro ao carregar range de anos: {e}")
-        return (2015, 2023)
+    As categorias de "country_name" são os países presentes nas linhas
+    carregadas, em ordem alfabética.
+    """
+    df = _query_table()
+
+    if df.empty:
+        raise RuntimeError("A base do Supabase retornou vazia.")
 
+    return df
 
-@st.cache_data(ttl=CACHE_TTL)
-def get_country_data(country_name: str) -> pd.DataFrame:
+
+# O spinner só aparece na primeira chamada do processo; as demais leem o cache
+@st.cache_resource(show_spinner="Loading countries...")
+def get_app_state() -> SimpleNamespace:
     """
-    Retorna todos os dados de um país específico.
+    Reúne, uma vez por processo, a base completa e os dados derivados dela.
+
+    Returns:
+    --------
+    SimpleNamespace
+        df: DataFrame completo; countries: lista ordenada de países;
+        years: tupla (min, max); by_country: dicionário {país: DataFrame}.
+
+    O objeto é compartilhado entre sessões: os DataFrames não devem ser
+    modificados in-place por quem os consome. Falhas na carga se propagam
+    sem deixar um estado vazio no cache; a próxima execução tenta de novo.
+    """
+    df = _load_full_table()
+
+    return SimpleNamespace(
+        df=df,
+        # As categorias vêm das linhas carregadas: todo país listado tem dados
+        countries=df["country_name"].cat.categories.tolist(),
+        years=(int(df["year"].min()), int(df["year"].max())),
+        by_country={
+            name: group.reset_index(drop=True)
+            for name, group in df.groupby("country_name", sort=False, observed=True)
+        },
+    )
+
+
+def get_country_data(
+    country_name: str, year_range: Optional[tuple] = None
+) -> pd.DataFrame:
     """
-    return load_complexity_data(countries=[country_name])
+    Retorna os dados de um país específico, opcionalmente recortados por anos.
 
+    Parameters:
+    -----------
+    country_name : str
+        Nome do país.
+    year_range : tuple, optional
+        Intervalo (inicial, final) de anos, inclusivo. Se None, todos os anos.
+    """
+    df = get_app_state().by_country.get(country_name, pd.DataFrame())
+    if year_range is None or df.empty:
+        return df
+    return slice_years(df, year_range)
 
-@st.cache_data(ttl=CACHE_TTL)
+
+def slice_years(df: pd.DataFrame, year_range: tuple) -> pd.DataFrame:
+    """
+    Recorta um DataFrame ordenado por ano ao intervalo (inicial, final).
+
+    Usa busca binária na coluna "year" em vez de uma máscara booleana, por
+    isso exige linhas ordenadas por ano (caso das fatias de get_app_state).
+    """
+    years = df["year"].to_numpy()
+    start = np.searchsorted(years, year_range[0], side="left")
+    end = np.searchsorted(years, year_range[1], side="right")
+    return df.iloc[start:end]
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
 def get_latest_year_data() -> pd.DataFrame:
     """
     Retorna dados do ano mais recente disponível.
     """
-    if not supabase_client:
-        st.error("Conexão com Supabase não estabelecida.")
-        return pd.DataFrame()
+    supabase_client = get_supabase_client()
 
-    try:
-        _, max_year = get_year_range()
-
-        response = (
-            supabase_client.table(TABLE_NAME)
-            .select("*")
-            .eq("year", max_year)
-            .order("indice_total", desc=True)
-            .execute()
-        )
+    _, max_year = get_year_range()
 
-        return pd.DataFrame(response.data)
+    response = (
+        supabase_client.table(TABLE_NAME)
+        .select(DATA_COLUMNS)
+        .eq("year", max_year)
+        .order("indice_total", desc=True)
+        .execute()
+    )
 
-    except Exception as e:
-        st.error(f"Erro ao carregar dados do último ano: {e}")
-        return pd.DataFrame()
+    return _prepare_dataframe(pd.DataFrame(response.data), _country_dtype())
 
 
-@st.cache_data(ttl=CACHE_TTL)
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
 def get_comparison_data(
-    countries: List[str], years: Optional[tuple] = None
+    countries: List[str], year_range: Optional[tuple] = None
 ) -> pd.DataFrame:
     """
     Retorna dados de múltiplos países para comparação.
     """
-    return load_complexity_data(countries=countries, years=years)
+    return load_complexity_data(
+        countries=tuple(sorted(countries)), year_range=year_range
+    )
 
 
 # ==============================================================================
@@ -224,7 +411,9 @@ def upload_data_to_supabase(batch_size: int = 500):
         print(f"❌ Erro ao conectar ao banco local: {e}")
         return
 
-    if not supabase_client:
+    try:
+        supabase_client = get_supabase_client()
+    except RuntimeError:
         print("❌ Conexão com Supabase não estabelecida.")
         return
 
@@ -245,10 +434,15 @@ def upload_data_to_supabase(batch_size: int = 500):
 
         # 2. Corrigir tipos de dados
         print("2/4: Corrigindo tipos de dados...")
-        for col in df.columns:
-            if pd.api.types.is_float_dtype(df[col]):
-                if (df[col].dropna() % 1 == 0).all():
-                    df[col] = df[col].astype("Int64")
+        # Uma única passada NumPy sobre todas as colunas float identifica as
+        # que só têm valores inteiros (ou nulos)
+        float_cols = df.select_dtypes("float").columns
+        values = df[float_cols].to_numpy(dtype="float64")
+        with np.errstate(invalid="ignore"):
+            integral = (np.isnan(values) | (values % 1 == 0)).all(axis=0)
+
+        for col in float_cols[integral]:
+            df[col] = df[col].astype("Int64")
 
         df.replace([np.inf, -np.inf], None, inplace=True)
         df = df.astype(object).where(pd.notna(df), None)
@@ -294,6 +488,7 @@ if __name__ == "__main__":
 
     upload_data_to_supabase()
 
+    print("\nReinicie o dashboard para que ele carregue a base atualizada.")
     print("\n" + "=" * 70)
     print("PROCESSO CONCLUÍDO!")
     print("=" * 70)